@@ -6,21 +6,35 @@ import datetime
 import json
 import logging
 import os
-import pyperclip
 import re
 import requests
 import sys
+import threading
 import yaml
 
+from contextlib import nullcontext
+from functools import lru_cache
 from pathlib import Path
 from prompt_toolkit import PromptSession, HTML
 from prompt_toolkit.history import FileHistory
-from rich.console import Console
+from requests.adapters import HTTPAdapter
+from rich.console import Console, Group
+from rich.live import Live
 from rich.logging import RichHandler
 from rich.markdown import Markdown
+from rich.markup import escape
+from rich.segment import Segment, Segments
+from rich.styled import Styled
 from typing import Optional
+from urllib3.util import Retry
 from xdg_base_dirs import xdg_config_home
 
+# Prefer the libyaml based (C) loader and dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+
 
 BASE = Path(xdg_config_home(), "chatgpt-cli")
 CONFIG_FILE = BASE / "config.yaml"
@@ -33,6 +47,24 @@ OPENAI_BASE_ENDPOINT = os.environ.get(
     "OPENAI_BASE_ENDPOINT", "https://api.openai.com/v1"
 )
 ENV_VAR = "OPENAI_API_KEY"
+# Connect and read timeouts (seconds) for API requests. A non-streamed completion
+# sends nothing until it is fully generated, which can take minutes with reasoning
+# models, while the read timeout of a streamed one applies between chunks.
+# A finite read timeout also catches a kept-alive connection silently dropped
+# by a NAT or proxy while the prompt was idle
+REQUEST_TIMEOUT = (10, 600)
+STREAM_TIMEOUT = (10, 60)
+# Retry failed connections and 503 (overloaded) responses before giving up.
+# Read errors, 502 and 504 are not retried, the server may already be generating
+# (and billing) a response for the request
+REQUEST_RETRIES = Retry(
+    total=2,
+    read=False,
+    backoff_factor=0.5,
+    status_forcelist=(503,),
+    allowed_methods=None,
+    raise_on_status=False,
+)
 
 # Azure price is not accurate, it depends on your subscription
 PRICING_RATE = {
@@ -68,6 +100,19 @@ logging.basicConfig(
 )
 
 
+# Commands that end the current prompt, mapped to the exception raised for them
+# (EOFError quits the chat, KeyboardInterrupt asks for a new prompt)
+COMMANDS = {
+    "/q": EOFError,
+    "": KeyboardInterrupt,
+}
+
+# A code fence (```) at the start of a line
+FENCE_RE = re.compile(r"^```", re.MULTILINE)
+
+# System message sent when markdown is enabled, to get well formatted replies
+MARKDOWN_INSTRUCTION = "Always use code blocks with the appropriate language tags. If asked for a table always format it using Markdown syntax."
+
 # Initialize the messages history list
 # It's mandatory to pass it at each API call in order to have a conversation
 messages = []
@@ -76,6 +121,11 @@ prompt_tokens = 0
 completion_tokens = 0
 # Initialize the console
 console = Console()
+# Initialize the HTTP session, reused across requests so that the connection
+# to the API (TCP and TLS handshake included) is kept alive between messages
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(max_retries=REQUEST_RETRIES))
+http_session.mount("http://", HTTPAdapter(max_retries=REQUEST_RETRIES))
 
 DEFAULT_CONFIG = {
     "supplier": "openai",
@@ -90,6 +140,7 @@ DEFAULT_CONFIG = {
     # 'max_tokens': 500,
     "markdown": True,
     "easy_copy": True,
+    "stream": False,
     "non_interactive": False,
     "json_mode": False,
     "use_proxy": False,
@@ -106,13 +157,23 @@ def load_config(config_file: str) -> dict:
     # If the config file does not exist, create one with default configurations
     if not Path(config_file).exists():
         os.makedirs(os.path.dirname(config_file), exist_ok=True)
-        with open(config_file, "w", encoding="utf-8") as file:
-            yaml.dump(DEFAULT_CONFIG, file, default_flow_style=False)
+        # Write a temporary file and move it into place, so that an interrupted
+        # first run never leaves a truncated config file behind
+        tmp_file = f"{config_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as file:
+            yaml.dump(
+                DEFAULT_CONFIG,
+                file,
+                Dumper=YamlDumper,
+                default_flow_style=False,
+                sort_keys=False,
+            )
+        os.replace(tmp_file, config_file)
         logger.info(f"New config file initialized: [green bold]{config_file}")
 
-    # Load existing config
-    with open(config_file, encoding="utf-8") as file:
-        config = yaml.load(file, Loader=yaml.FullLoader)
+    # Load existing config, handing the whole file to the parser as one buffer
+    with open(config_file, "rb") as file:
+        config = yaml.load(file.read(), Loader=YamlLoader)
 
     # Update the loaded config with any default values that are missing
     for key, value in DEFAULT_CONFIG.items():
@@ -136,20 +197,21 @@ def get_last_save_file() -> str:
     """
     Return the timestamp of the last saved session
     """
-    files = [f for f in os.listdir(SAVE_FOLDER) if f.endswith(".json")]
-    if files:
-        ts = [f.replace("chatgpt-session-", "").replace(".json", "") for f in files]
-        ts.sort()
-        return ts[-1]
-    return None
+    with os.scandir(SAVE_FOLDER) as entries:
+        ts = (
+            entry.name.replace("chatgpt-session-", "").replace(".json", "")
+            for entry in entries
+            if entry.name.endswith(".json")
+        )
+        return max(ts, default=None)
 
 
 def create_save_folder() -> None:
     """
     Create the session history folder if not exists
     """
-    if not os.path.exists(SAVE_FOLDER):
-        os.mkdir(SAVE_FOLDER)
+    # A single mkdir call, without checking for the folder first
+    os.makedirs(SAVE_FOLDER, exist_ok=True)
 
 
 def save_history(
@@ -158,26 +220,26 @@ def save_history(
     """
     Save the conversation history in JSON format
     """
-    with open(os.path.join(SAVE_FOLDER, SAVE_FILE), "w", encoding="utf-8") as f:
-        json.dump(
-            {
-                "model": model,
-                "messages": messages,
-                "prompt_tokens": prompt_tokens,
-                "completion_tokens": completion_tokens,
-            },
-            f,
-            indent=4,
-            ensure_ascii=False,
-        )
+    # Serialize the whole session first and write it with a single call,
+    # json.dump() would issue a write for every chunk of the encoded output
+    content = json.dumps(
+        {
+            "model": model,
+            "messages": messages,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+        },
+        indent=4,
+        ensure_ascii=False,
+    )
+    (SAVE_FOLDER / SAVE_FILE).write_text(content, encoding="utf-8")
 
 
 def add_markdown_system_message() -> None:
     """
     Try to force ChatGPT to always respond with well formatted code blocks and tables if markdown is enabled.
     """
-    instruction = "Always use code blocks with the appropriate language tags. If asked for a table always format it using Markdown syntax."
-    messages.append({"role": "system", "content": instruction})
+    messages.append({"role": "system", "content": MARKDOWN_INSTRUCTION})
 
 
 def calculate_expense(
@@ -226,6 +288,47 @@ def display_expense(model: str) -> None:
         )
 
 
+def find_fence(content: str, start: int) -> int:
+    """
+    Return the offset of the next line starting with a code fence (```), or -1 if there is none
+    """
+    # The anchored pattern skips backticks in the middle of a line in the same scan
+    match = FENCE_RE.search(content, start)
+    return match.start() if match else -1
+
+
+def iter_markdown_blocks(content: str):
+    """
+    Split markdown content into regular text and fenced code blocks, in a single pass
+    jumping from fence to fence. Yield (text, language) tuples, where language is None
+    for regular text and the (possibly empty) language tag for a code block.
+    """
+    # Offset where the current run of regular text or code starts
+    run_start = 0
+    code_block_language = None
+
+    fence = find_fence(content, 0)
+    while fence != -1:
+        line_end = content.find("\n", fence)
+        if line_end == -1:
+            line_end = len(content)
+
+        if code_block_language is None:
+            if fence > run_start:
+                yield content[run_start : fence - 1], None
+            code_block_language = content[fence:line_end].replace("```", "").strip()
+        else:
+            yield content[run_start : fence - 1], code_block_language
+            code_block_language = None
+
+        run_start = line_end + 1
+        fence = find_fence(content, run_start)
+
+    # Any remaining content is printed as is, including a code block that was never closed
+    if code_block_language is not None or run_start <= len(content):
+        yield content[run_start:], None
+
+
 def print_markdown(content: str, code_blocks: Optional[dict] = None):
     """
     Print markdown formatted text to the terminal.
@@ -235,47 +338,185 @@ def print_markdown(content: str, code_blocks: Optional[dict] = None):
         console.print(Markdown(content))
         return
 
-    lines = content.split("\n")
-    code_block_id = 0 if code_blocks is None else 1 + max(code_blocks.keys(), default=0)
-    code_block_open = False
-    code_block_language = ""
-    code_block_content = []
-    regular_content = []
-
-    for line in lines:
-        if line.startswith("```") and not code_block_open:
-            code_block_open = True
-            code_block_language = line.replace("```", "").strip()
-            if regular_content:
-                console.print(Markdown("\n".join(regular_content)))
-                regular_content = []
-        elif line.startswith("```") and code_block_open:
-            code_block_open = False
-            snippet_text = "\n".join(code_block_content)
-            if code_blocks is not None:
-                code_blocks[code_block_id] = snippet_text
-            formatted_code_block = f"```{code_block_language}\n{snippet_text}\n```"
-            console.print(f"Block {code_block_id}", style="blue", justify="right")
-            console.print(Markdown(formatted_code_block))
-            code_block_id += 1
-            code_block_content = []
-            code_block_language = ""
-        elif code_block_open:
-            code_block_content.append(line)
-        else:
-            regular_content.append(line)
+    # Blocks are numbered contiguously from 1, so the next free ID is the count + 1
+    code_block_id = len(code_blocks) + 1
+    # Collect everything and print it in one go, rendering and writing once
+    renderables = []
+
+    for text, language in iter_markdown_blocks(content):
+        if language is None:
+            renderables.append(Markdown(text))
+            continue
+        code_blocks[code_block_id] = text
+        formatted_code_block = f"```{language}\n{text}\n```"
+        # Highlighted and styled the same way console.print() does for a string
+        label = console.render_str(f"Block {code_block_id}")
+        label.justify = "right"
+        renderables.append(Styled(label, "blue"))
+        renderables.append(Markdown(formatted_code_block))
+        code_block_id += 1
 
-    if code_block_open:  # uh-oh, the code block was never closed.
-        console.print(Markdown("\n".join(code_block_content)))
-    elif regular_content:  # If there's any remaining regular content, print it
-        console.print(Markdown("\n".join(regular_content)))
+    console.print(Group(*renderables))
+
+
+def build_api_request(config: dict) -> dict:
+    """
+    Build the supplier specific parts of a chat completion request (endpoint, headers and model).
+    They only depend on the configuration, so they are computed once per session.
+    """
+    if config["supplier"] == "azure":
+        return {
+            "url": f"{config['azure_endpoint']}/openai/deployments/{config['azure_deployment_name']}/chat/completions?api-version={config['azure_api_version']}",
+            "headers": {
+                "Content-Type": "application/json",
+                "api-key": config["azure_api_key"],
+            },
+            "model": config["azure_deployment_name"],
+        }
+
+    return {
+        "url": f"{OPENAI_BASE_ENDPOINT}/chat/completions",
+        "headers": {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {config['api-key']}",
+        },
+        "model": config["model"],
+    }
+
+
+def prewarm_connection(url: str, proxy: dict | None) -> None:
+    """
+    Open the connection to the API while the user is typing the first message,
+    so that the first request finds it in the pool and skips the TCP and TLS handshake
+    """
+    try:
+        http_session.head(url, proxies=proxy, timeout=REQUEST_TIMEOUT[0])
+    except requests.RequestException:
+        # Nothing lost, the first request will just open the connection itself
+        pass
+
+
+def render_tail(content: str) -> Segments:
+    """
+    Render markdown content keeping only the last lines that fit in the terminal, so the
+    newest text of a long streamed response stays visible in the live view
+    """
+    lines = console.render_lines(Markdown(content), pad=False)
+    # Leave a row for the cursor below the live view
+    tail = lines[-(console.size.height - 1) :]
+    segments = []
+    for line in tail:
+        segments.extend(line)
+        segments.append(Segment.line())
+    return Segments(segments)
+
+
+def read_stream(r: requests.Response, markdown: bool) -> tuple[dict, Optional[dict]]:
+    """
+    Read a streamed (server-sent events) completion, showing the content as it arrives.
+    In markdown mode the partial response is shown in a transient live view, which is
+    replaced by the final rendering. Otherwise the content is written straight to stdout.
+    Return the assembled message and the usage, or None if the supplier did not send it.
+    Ctrl+C stops the generation and returns what arrived so far, it is re-raised if
+    nothing did. Raise ValueError if the stream reports an error, is malformed or
+    carries no content.
+    """
+    chunks = []
+    usage = None
+    # The plain text output is stripped like a full response: leading whitespace is
+    # skipped and trailing whitespace held back until more text follows
+    printed = False
+    pending = ""
+
+    # The live view re-renders the markdown at its own refresh rate, not on every chunk
+    if markdown:
+        view = Live(
+            console=console,
+            transient=True,
+            refresh_per_second=8,
+            get_renderable=lambda: render_tail("".join(chunks)),
+        )
+    else:
+        view = nullcontext()
+
+    try:
+        with view:
+            for line in r.iter_lines():
+                # Skip keep-alive blank lines and SSE comments
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                # Keep reading past the end marker until the body is exhausted,
+                # so that the connection is released back to the pool for reuse
+                if data == b"[DONE]":
+                    continue
+                try:
+                    chunk = json.loads(data)
+                except json.JSONDecodeError:
+                    raise ValueError("Invalid data in the response stream")
+                if chunk.get("error"):
+                    raise ValueError(chunk["error"].get("message", "Unknown error"))
+                if chunk.get("usage"):
+                    usage = chunk["usage"]
+                if chunk.get("choices"):
+                    delta = chunk["choices"][0].get("delta", {}).get("content")
+                    if delta:
+                        chunks.append(delta)
+                        if not markdown:
+                            text = pending + delta if printed else delta.lstrip()
+                            visible = text.rstrip()
+                            if visible:
+                                print(visible, end="", flush=True)
+                                printed = True
+                            pending = text[len(visible) :]
+    except KeyboardInterrupt:
+        # Closing the response drops the connection, which stops the generation
+        r.close()
+        if not chunks:
+            raise
+    finally:
+        # End the plain text line, also when the stream fails halfway
+        if printed:
+            print()
+
+    content = "".join(chunks).strip()
+    if not content:
+        raise ValueError("The response stream carried no content")
+
+    return {"role": "assistant", "content": content}, usage
+
+
+def parse_copy_command(command: str) -> Optional[int]:
+    """
+    Return the block ID of a /c <ID> or /copy <ID> command, None if there is none
+    """
+    # Parsed by hand, the grammar is too small to be worth a regex
+    argument = command[2:]
+    if argument[:3] == "opy":
+        argument = argument[3:]
+    argument = argument.lstrip()
+    end = 0
+    while end < len(argument) and argument[end].isdecimal():
+        end += 1
+    return int(argument[:end]) if end else None
+
+
+@lru_cache(maxsize=1)
+def build_prompt(total_tokens: int) -> HTML:
+    """
+    Build the input prompt, showing the tokens used so far.
+    The token count only changes after a completion, so re-prompts after commands
+    or errors reuse the already parsed HTML.
+    """
+    return HTML(f"<b>[{total_tokens}] >>> </b>")
 
 
 def start_prompt(
-    session: PromptSession,
+    session: Optional[PromptSession],
     config: dict,
     copyable_blocks: Optional[dict],
     proxy: dict | None,
+    api_request: dict,
 ) -> None:
     """
     Ask the user for input, build the request and perform it
@@ -287,22 +528,31 @@ def start_prompt(
     message = ""
 
     if config["non_interactive"]:
-        message = sys.stdin.read()
-    else:
-        message = session.prompt(
-            HTML(f"<b>[{prompt_tokens + completion_tokens}] >>> </b>")
+        # Read the raw bytes and decode them in one pass, with the stream's own settings
+        message = sys.stdin.buffer.read().decode(
+            sys.stdin.encoding or "utf-8", sys.stdin.errors or "strict"
         )
+        if sys.platform == "win32":
+            # Like sys.stdin, which reads in universal newlines mode on Windows
+            message = message.replace("\r\n", "\n").replace("\r", "\n")
+    else:
+        message = session.prompt(build_prompt(prompt_tokens + completion_tokens))
 
-    if message.lower().strip() == "/q":
-        raise EOFError
-    if message.lower() == "":
-        raise KeyboardInterrupt
+    command = message.strip()
 
-    if config["easy_copy"] and message.lower().startswith("/c"):
-        # Use regex to find digits after /c or /copy
-        match = re.search(r"^/c(?:opy)?\s*(\d+)", message.lower())
-        if match:
-            block_id = int(match.group(1))
+    # Only empty input and slash commands are dispatched, so a regular
+    # prompt is never lowercased as a whole
+    if command[:1] in ("", "/"):
+        command = command.lower()
+        if command in COMMANDS:
+            raise COMMANDS[command]
+
+    if config["easy_copy"] and command[:2] == "/c":
+        # Imported here, it pulls in subprocess and is only needed to copy
+        import pyperclip
+
+        block_id = parse_copy_command(command)
+        if block_id is not None:
             if block_id in copyable_blocks:
                 try:
                     pyperclip.copy(copyable_blocks[block_id])
@@ -323,21 +573,9 @@ def start_prompt(
 
     messages.append({"role": "user", "content": message})
 
-    if config["supplier"] == "azure":
-        api_key = config["azure_api_key"]
-        model = config["azure_deployment_name"]
-        api_version = config["azure_api_version"]
-        base_endpoint = config["azure_endpoint"]
-    elif config["supplier"] == "openai":
-        api_key = config["api-key"]
-        model = config["model"]
-        base_endpoint = OPENAI_BASE_ENDPOINT
-    else:
-        logger.error("Supplier must be either 'azure' or 'openai'")
-
     # Base body parameters
     body = {
-        "model": model,
+        "model": api_request["model"],
         "temperature": config["temperature"],
         "messages": messages,
     }
@@ -346,30 +584,21 @@ def start_prompt(
         body["max_tokens"] = config["max_tokens"]
     if config["json_mode"]:
         body["response_format"] = {"type": "json_object"}
+    if config["stream"]:
+        body["stream"] = True
+        # Azure only accepts stream_options on recent API versions
+        if config["supplier"] == "openai":
+            body["stream_options"] = {"include_usage": True}
 
     try:
-        if config["supplier"] == "azure":
-            headers = {
-                "Content-Type": "application/json",
-                "api-key": api_key,
-            }
-            r = requests.post(
-                f"{base_endpoint}/openai/deployments/{model}/chat/completions?api-version={api_version}",
-                headers=headers,
-                json=body,
-                proxies=proxy,
-            )
-        elif config["supplier"] == "openai":
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {api_key}",
-            }
-            r = requests.post(
-                f"{base_endpoint}/chat/completions",
-                headers=headers,
-                json=body,
-                proxies=proxy,
-            )
+        r = http_session.post(
+            api_request["url"],
+            headers=api_request["headers"],
+            json=body,
+            proxies=proxy,
+            stream=config["stream"],
+            timeout=STREAM_TIMEOUT if config["stream"] else REQUEST_TIMEOUT,
+        )
     except requests.ConnectionError:
         logger.error(
             "[red bold]Connection error, try again...", extra={"highlighter": None}
@@ -382,28 +611,61 @@ def start_prompt(
         )
         messages.pop()
         raise KeyboardInterrupt
+    except KeyboardInterrupt:
+        # Cancelled while waiting for the response, drop the unanswered message
+        messages.pop()
+        raise
 
     match r.status_code:
         case 200:
-            response = r.json()
-
-            message_response = response["choices"][0]["message"]
-            usage_response = response["usage"]
-
             if not config["non_interactive"]:
                 console.line()
+
+            if config["stream"]:
+                try:
+                    message_response, usage_response = read_stream(
+                        r, config["markdown"]
+                    )
+                except requests.RequestException:
+                    logger.error(
+                        "[red bold]Connection lost while streaming, try again...",
+                        extra={"highlighter": None},
+                    )
+                    messages.pop()
+                    raise KeyboardInterrupt
+                except ValueError as e:
+                    r.close()
+                    logger.error(
+                        f"[red bold]Streaming error: {escape(str(e))}",
+                        extra={"highlighter": None},
+                    )
+                    messages.pop()
+                    raise KeyboardInterrupt
+                except KeyboardInterrupt:
+                    # Interrupted before any content arrived, drop the unanswered message
+                    messages.pop()
+                    raise
+            else:
+                response = r.json()
+                message_response = response["choices"][0]["message"]
+                usage_response = response["usage"]
+
             if config["markdown"]:
                 print_markdown(message_response["content"].strip(), copyable_blocks)
-            else:
+            elif not config["stream"]:
                 print(message_response["content"].strip())
             if not config["non_interactive"]:
                 console.line()
 
             # Update message history and token counters
+            # (a streamed response carries no usage if the supplier does not report it)
             messages.append(message_response)
-            prompt_tokens += usage_response["prompt_tokens"]
-            completion_tokens += usage_response["completion_tokens"]
-            save_history(model, messages, prompt_tokens, completion_tokens)
+            if usage_response:
+                prompt_tokens += usage_response["prompt_tokens"]
+                completion_tokens += usage_response["completion_tokens"]
+            save_history(
+                api_request["model"], messages, prompt_tokens, completion_tokens
+            )
 
             if config["non_interactive"]:
                 # In non-interactive mode there is no looping back for a second prompt, you're done.
@@ -442,7 +704,7 @@ def start_prompt(
             messages.pop()
             raise KeyboardInterrupt
 
-        case 502 | 503:
+        case 502 | 503 | 504:
             logger.error(
                 "[red bold]The server seems to be overloaded, try again",
                 extra={"highlighter": None},
@@ -498,12 +760,17 @@ def main(
 
     logger.info("[bold]ChatGPT CLI", extra={"highlighter": None})
 
-    history = FileHistory(HISTORY_FILE)
-
-    if multiline:
-        session = PromptSession(history=history, multiline=True)
+    # The prompt session (terminal setup and input history) is only needed to
+    # read input interactively, in non interactive mode the input comes from stdin
+    if non_interactive:
+        session = None
     else:
-        session = PromptSession(history=history)
+        history = FileHistory(HISTORY_FILE)
+
+        if multiline:
+            session = PromptSession(history=history, multiline=True)
+        else:
+            session = PromptSession(history=history)
 
     try:
         config = load_config(CONFIG_FILE)
@@ -551,10 +818,16 @@ def main(
 
     copyable_blocks = {} if config["easy_copy"] else None
 
-    if config["supplier"] == "azure":
-        model = config["azure_deployment_name"]
-    elif config["supplier"] == "openai":
-        model = config["model"]
+    if config["supplier"] not in ("azure", "openai"):
+        logger.error(
+            "[red bold]Supplier must be either 'azure' or 'openai'",
+            extra={"highlighter": None},
+        )
+        sys.exit(1)
+
+    # Endpoint, headers and model only depend on the configuration
+    api_request = build_api_request(config)
+    model = api_request["model"]
 
     # Run the display expense function when exiting the script
     atexit.register(display_expense, model=model)
@@ -588,8 +861,7 @@ def main(
             # If this feature is used --context is cleared
             messages.clear()
             history_data = load_history_data(os.path.join(SAVE_FOLDER, restore_file))
-            for message in history_data["messages"]:
-                messages.append(message)
+            messages.extend(history_data["messages"])
             prompt_tokens += history_data["prompt_tokens"]
             completion_tokens += history_data["completion_tokens"]
             logger.info(
@@ -608,12 +880,18 @@ def main(
         )
 
     if not non_interactive:
+        threading.Thread(
+            target=prewarm_connection, args=(api_request["url"], proxy), daemon=True
+        ).start()
         console.rule()
 
     while True:
         try:
-            start_prompt(session, config, copyable_blocks, proxy)
+            start_prompt(session, config, copyable_blocks, proxy, api_request)
         except KeyboardInterrupt:
+            # Piped input is read in full on the first pass, there is nothing to retry with
+            if config["non_interactive"]:
+                break
             continue
         except EOFError:
             break